@@ -1,4 +1,7 @@
+import functools
 import os
+import threading
+from collections.abc import Callable
 from dataclasses import MISSING, Field
 from typing import Any, Literal, cast, overload
 
@@ -7,32 +10,111 @@ from ruamel.yaml.comments import CommentedMap
 
 from serena.constants import SERENA_FILE_ENCODING
 
+_yaml_rt_lock = threading.Lock()
+"""
+lock guarding the use of the shared round-trip YAML instance (which is not thread-safe), see `_get_yaml_rt`
+"""
 
-def _create_YAML(preserve_comments: bool = False) -> YAML:
+_yaml_safe_lock = threading.Lock()
+"""
+lock guarding the use of the shared safe YAML instance (which is not thread-safe), see `_get_yaml_safe`
+"""
+
+_ensured_dirs: set[str] = set()
+"""
+the directories in which YAML files are saved whose existence has already been ensured in this process
+"""
+_ensured_dirs_lock = threading.Lock()
+
+
+@functools.cache
+def _get_yaml_rt() -> YAML:
     """
-    Creates a YAML that can load/save with comments if preserve_comments is True.
+    Gets the shared comment-preserving YAML instance, creating it on first use.
+    The instance must only be used while holding `_yaml_rt_lock`.
     """
-    typ = None if preserve_comments else "safe"
-    result = YAML(typ=typ)
-    result.preserve_quotes = preserve_comments
+    result = YAML()
+    result.preserve_quotes = True
     return result
 
 
+@functools.cache
+def _get_yaml_safe() -> YAML:
+    """
+    Gets the shared (non-comment-preserving) safe YAML instance, creating it on first use.
+    The instance must only be used while holding `_yaml_safe_lock`.
+    """
+    return YAML(typ="safe")
+
+
 @overload
 def load_yaml(path: str, preserve_comments: Literal[False]) -> dict: ...
 @overload
 def load_yaml(path: str, preserve_comments: Literal[True]) -> CommentedMap: ...
 def load_yaml(path: str, preserve_comments: bool = False) -> dict | CommentedMap:
-    with open(path, encoding=SERENA_FILE_ENCODING) as f:
-        yaml = _create_YAML(preserve_comments)
-        return yaml.load(f)
+    if preserve_comments:
+        # comment-preserving data is typically modified and saved back, so it is always parsed anew
+        with open(path, encoding=SERENA_FILE_ENCODING) as f, _yaml_rt_lock:
+            return _get_yaml_rt().load(f)
+    # ruamel decodes binary streams itself (UTF-8 unless a BOM indicates otherwise), avoiding text-mode decoding overhead
+    with open(path, "rb") as f, _yaml_safe_lock:
+        return _get_yaml_safe().load(f)
 
 
-def save_yaml(path: str, data: dict | CommentedMap, preserve_comments: bool = False) -> None:
-    yaml = _create_YAML(preserve_comments)
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+def _ensure_dir(dir_path: str) -> None:
+    """
+    Creates the given directory (including parents) unless it has already been ensured in this process.
+    """
+    if dir_path in _ensured_dirs:
+        return
+    with _ensured_dirs_lock:
+        os.makedirs(dir_path, exist_ok=True)
+        _ensured_dirs.add(dir_path)
+
+
+def _write_yaml(path: str, data: dict | CommentedMap, preserve_comments: bool) -> None:
     with open(path, "w", encoding=SERENA_FILE_ENCODING) as f:
-        yaml.dump(data, f)
+        if not preserve_comments:
+            with _yaml_safe_lock:
+                _get_yaml_safe().dump(data, f)
+            return
+        with _yaml_rt_lock:
+            _get_yaml_rt().dump(data, f)
+
+
+def save_yaml(path: str, data: dict | CommentedMap, preserve_comments: bool = False) -> None:
+    dir_path = os.path.dirname(path)
+    if dir_path:
+        _ensure_dir(dir_path)
+    try:
+        _write_yaml(path, data, preserve_comments)
+    except FileNotFoundError:
+        if not dir_path:
+            raise
+        # the directory was removed after its existence had been ensured
+        _ensured_dirs.discard(dir_path)
+        _ensure_dir(dir_path)
+        _write_yaml(path, data, preserve_comments)
+
+
+_NO_DEFAULT = object()
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_dataclass_defaults(cls: type) -> dict[str, tuple[Any, Callable[[], Any] | None]]:
+    """
+    :param cls: the dataclass type
+    :return: a mapping from field name to a pair (default value, default factory),
+        where the default value is `_NO_DEFAULT` if the field does not have a default value
+        and the default factory is None if the field does not have a default factory
+    """
+    result: dict[str, tuple[Any, Callable[[], Any] | None]] = {}
+    for name, field in cls.__dataclass_fields__.items():  # type: ignore[attr-defined]
+        field = cast(Field, field)
+        default = field.default if field.default is not MISSING else _NO_DEFAULT
+        default_factory = field.default_factory if field.default_factory is not MISSING else None
+        result[name] = (default, default_factory)
+    return result
 
 
 def get_dataclass_default(cls: type, field_name: str) -> Any:
@@ -43,12 +125,12 @@ def get_dataclass_default(cls: type, field_name: str) -> Any:
     :param field_name: The name of the field.
     :return: The default value of the field (either from default or default_factory).
     """
-    field = cast(Field, cls.__dataclass_fields__[field_name])  # type: ignore[attr-defined]
+    default, default_factory = _get_dataclass_defaults(cls)[field_name]
 
-    if field.default is not MISSING:
-        return field.default
+    if default is not _NO_DEFAULT:
+        return default
 
-    if field.default_factory is not MISSING:  # default_factory is a function
-        return field.default_factory()
+    if default_factory is not None:  # the factory is called anew, such that mutable defaults are not shared
+        return default_factory()
 
     raise AttributeError(f"{field_name} has no default")
@@ -4,14 +4,13 @@ Provides F# specific instantiation of the LanguageServer class.
 
 import logging
 import os
-import pathlib
 import shutil
+import subprocess
 import threading
 from pathlib import Path
 
 from overrides import override
 
-from solidlsp.language_servers.common import RuntimeDependency, RuntimeDependencyCollection
 from solidlsp.ls import SolidLanguageServer
 from solidlsp.ls_config import LanguageServerConfig
 from solidlsp.ls_exceptions import SolidLSPException
@@ -21,6 +20,265 @@ from solidlsp.settings import SolidLSPSettings
 
 log = logging.getLogger(__name__)
 
+_dotnet_version_cache: dict[tuple[str, int], str] = {}
+"""
+cache of the .NET SDK version reported by `dotnet --version`, keyed by (dotnet executable path, its mtime in ns)
+"""
+_dotnet_root_cache: dict[tuple[str, int], str] = {}
+"""
+cache of the .NET root directory determined via `dotnet --info`, keyed by (dotnet executable path, its mtime in ns)
+"""
+
+
+_which_cache: dict[tuple[str, str], str] = {}
+"""
+cache of executable paths found via `shutil.which`, keyed by (executable name, value of PATH)
+"""
+
+
+def _which_cached(name: str, path_env: str) -> str | None:
+    """
+    Cached version of `shutil.which`; the value of PATH is part of the cache key, such that changes to it are respected.
+    Only successful lookups are cached, such that an executable which is installed later on can still be found,
+    and a cached path is re-validated before it is returned, such that an executable which was removed or moved is looked up anew.
+    """
+    cache_key = (name, path_env)
+    result = _which_cache.get(cache_key)
+    if result is not None and _is_executable_file(result):
+        return result
+    _which_cache.pop(cache_key, None)
+    result = shutil.which(name, path=path_env)
+    if result is not None:
+        _which_cache[cache_key] = result
+    return result
+
+
+def _is_executable_file(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _find_dotnet_executable() -> str | None:
+    """
+    :return: the path to the dotnet executable found in PATH or None if it cannot be found
+    """
+    return _which_cached("dotnet", os.environ.get("PATH", os.defpath))
+
+
+def clear_dotnet_caches() -> None:
+    """
+    Clears the process-wide caches of the dotnet executable's location, of results obtained from it
+    and of the verified FsAutoComplete installations, such that they are determined anew.
+    """
+    _which_cache.clear()
+    _dotnet_version_cache.clear()
+    _dotnet_root_cache.clear()
+    _verified_fsautocomplete_paths.clear()
+
+
+def _dotnet_cache_key(dotnet_exe: str) -> tuple[str, int] | None:
+    """
+    :param dotnet_exe: the path to the dotnet executable
+    :return: the key under which results for the given executable are cached or None if the executable cannot be stat'ed,
+        in which case results must not be cached
+    """
+    try:
+        mtime_ns = os.stat(dotnet_exe).st_mtime_ns
+    except OSError:
+        return None
+    return dotnet_exe, mtime_ns
+
+
+def _get_dotnet_version(dotnet_exe: str) -> str:
+    """
+    :param dotnet_exe: the path to the dotnet executable
+    :return: the .NET SDK version (cached for the lifetime of the process)
+    """
+    cache_key = _dotnet_cache_key(dotnet_exe)
+    version = _dotnet_version_cache.get(cache_key) if cache_key is not None else None
+    if version is None:
+        result = subprocess.run([dotnet_exe, "--version"], capture_output=True, text=True, check=True)
+        version = result.stdout.strip()
+        if cache_key is not None:
+            _dotnet_version_cache[cache_key] = version
+    return version
+
+
+def _get_dotnet_root_from_info(dotnet_exe: str) -> str:
+    """
+    :param dotnet_exe: the path to the dotnet executable
+    :return: the .NET root directory as determined from the output of `dotnet --info` (cached for the lifetime of the process),
+        falling back to the directory containing the dotnet executable (not cached)
+    """
+    cache_key = _dotnet_cache_key(dotnet_exe)
+    dotnet_root = _dotnet_root_cache.get(cache_key) if cache_key is not None else None
+    if dotnet_root is None:
+        # Fallback: use the directory containing dotnet executable
+        dotnet_root = str(Path(dotnet_exe).parent)
+        # Try to get the installation path
+        try:
+            result = subprocess.run([dotnet_exe, "--info"], capture_output=True, text=True, check=True)
+        except (subprocess.CalledProcessError, Exception):
+            return dotnet_root
+        lines = result.stdout.split("\n")
+        for line in lines:
+            if "Base Path:" in line or "Base path:" in line:
+                base_path = line.split(":", 1)[1].strip()
+                # Get the parent directory (remove 'sdk/version' part)
+                dotnet_root = str(Path(base_path).parent.parent)
+                break
+        if cache_key is not None:
+            _dotnet_root_cache[cache_key] = dotnet_root
+    return dotnet_root
+
+
+_FSHARP_IGNORED_DIRNAMES = frozenset({"bin", "obj", "packages", ".paket", "paket-files", ".fake", ".ionide"})
+"""
+names of F# build output, package and tooling directories which are ignored in addition to the generally ignored directories
+"""
+
+_FSAUTOCOMPLETE_ARGS = ("--adaptive-lsp-server-enabled", "--project-graph-enabled", "--use-fcs-transparent-compiler")
+"""
+the command line arguments with which FsAutoComplete is launched
+"""
+
+_verified_fsautocomplete_paths: set[str] = set()
+"""
+the FsAutoComplete executable paths whose existence has already been verified in this process
+(re-validated before use, such that a removed installation is reinstalled)
+"""
+
+_BASE_CAPABILITIES = {
+    "workspace": {
+        "applyEdit": True,
+        "workspaceEdit": {"documentChanges": True},
+        "didChangeConfiguration": {"dynamicRegistration": True},
+        "didChangeWatchedFiles": {"dynamicRegistration": True},
+        "symbol": {"dynamicRegistration": True},
+        "executeCommand": {"dynamicRegistration": True},
+        "configuration": True,
+        "workspaceFolders": True,
+    },
+    "textDocument": {
+        "synchronization": {
+            "dynamicRegistration": True,
+            "willSave": True,
+            "willSaveWaitUntil": True,
+            "didSave": True,
+        },
+        "completion": {
+            "dynamicRegistration": True,
+            "contextSupport": True,
+            "completionItem": {
+                "snippetSupport": True,
+                "commitCharactersSupport": True,
+                "documentationFormat": ["markdown", "plaintext"],
+                "deprecatedSupport": True,
+            },
+        },
+        "hover": {
+            "dynamicRegistration": True,
+            "contentFormat": ["markdown", "plaintext"],
+        },
+        "signatureHelp": {
+            "dynamicRegistration": True,
+            "signatureInformation": {"documentationFormat": ["markdown", "plaintext"]},
+        },
+        "definition": {"dynamicRegistration": True},
+        "references": {"dynamicRegistration": True},
+        "documentHighlight": {"dynamicRegistration": True},
+        "documentSymbol": {
+            "dynamicRegistration": True,
+            "symbolKind": {"valueSet": tuple(range(1, 26))},  # All SymbolKind values
+            "hierarchicalDocumentSymbolSupport": True,
+        },
+        "codeAction": {
+            "dynamicRegistration": True,
+            "codeActionLiteralSupport": {
+                "codeActionKind": {
+                    "valueSet": [
+                        "",
+                        "quickfix",
+                        "refactor",
+                        "refactor.extract",
+                        "refactor.inline",
+                        "refactor.rewrite",
+                        "source",
+                        "source.organizeImports",
+                    ]
+                }
+            },
+        },
+        "codeLens": {"dynamicRegistration": True},
+        "formatting": {"dynamicRegistration": True},
+        "rangeFormatting": {"dynamicRegistration": True},
+        "onTypeFormatting": {"dynamicRegistration": True},
+        "rename": {"dynamicRegistration": True},
+        "documentLink": {"dynamicRegistration": True},
+        "publishDiagnostics": {
+            "relatedInformation": True,
+            "versionSupport": False,
+            "tagSupport": {"valueSet": [1, 2]},
+        },
+        "implementation": {"dynamicRegistration": True},
+        "typeDefinition": {"dynamicRegistration": True},
+        "colorProvider": {"dynamicRegistration": True},
+        "foldingRange": {
+            "dynamicRegistration": True,
+            "rangeLimit": 5000,
+            "lineFoldingOnly": True,
+        },
+        "declaration": {"dynamicRegistration": True},
+        "selectionRange": {"dynamicRegistration": True},
+    },
+    "window": {
+        "workDoneProgress": True,
+    },
+}
+"""
+the static client capabilities sent to FsAutoComplete upon initialization
+"""
+
+_BASE_INITIALIZATION_OPTIONS = {
+    # F# specific initialization options
+    "automaticWorkspaceInit": True,
+    "abstractClassStubGeneration": True,
+    "abstractClassStubGenerationObjectIdentifier": "this",
+    "abstractClassStubGenerationMethodBody": 'failwith "Not Implemented"',
+    "addFsiWatcher": False,
+    "codeLenses": {"signature": {"enabled": True}, "references": {"enabled": True}},
+    "disableInMemoryProjectReferences": False,
+    "enableMSBuildProjectGraph": False,
+    "excludeProjectDirectories": ["paket-files"],
+    "externalAutocomplete": False,
+    "fsac": {"attachDebugger": False, "silencedLogs": [], "conserveMemory": False, "netCoreDllPath": ""},
+    "fsiExtraParameters": [],
+    "generateBinlog": False,
+    "interfaceStubGeneration": True,
+    "interfaceStubGenerationObjectIdentifier": "this",
+    "interfaceStubGenerationMethodBody": 'failwith "Not Implemented"',
+    "keywordsAutocomplete": True,
+    "linter": True,
+    "pipelineHints": {"enabled": True},
+    "recordStubGeneration": True,
+    "recordStubGenerationBody": 'failwith "Not Implemented"',
+    "resolveNamespaces": True,
+    "saveOnlyOpenFiles": False,
+    "showProjectExplorerIn": ["ionide", "solution"],
+    "simplifyNameAnalyzer": True,
+    "smartIndent": False,
+    "suggestGitignore": True,
+    "suggestSdkScripts": True,
+    "unionCaseStubGeneration": True,
+    "unionCaseStubGenerationBody": 'failwith "Not Implemented"',
+    "unusedDeclarationsAnalyzer": True,
+    "unusedOpensAnalyzer": True,
+    "verboseLogging": False,
+    "workspaceModePeekDeepLevel": 2,
+}
+"""
+the static F# specific initialization options (the dynamic options are added in `_get_initialize_params`)
+"""
+
 
 class FSharpLanguageServer(SolidLanguageServer):
     """
@@ -33,11 +291,11 @@ class FSharpLanguageServer(SolidLanguageServer):
         Creates an FSharpLanguageServer instance. This class is not meant to be instantiated directly.
         Use LanguageServer.create() instead.
         """
-        fsharp_lsp_executable_path = self._setup_runtime_dependencies(config, solidlsp_settings)
+        fsharp_lsp_cmd = self._setup_runtime_dependencies(config, solidlsp_settings)
         super().__init__(
             config,
             repository_root_path,
-            ProcessLaunchInfo(cmd=fsharp_lsp_executable_path, cwd=repository_root_path),
+            ProcessLaunchInfo(cmd=fsharp_lsp_cmd, cwd=repository_root_path),
             "fsharp",
             solidlsp_settings,
         )
@@ -46,48 +304,26 @@ class FSharpLanguageServer(SolidLanguageServer):
 
     @override
     def is_ignored_dirname(self, dirname: str) -> bool:
-        return super().is_ignored_dirname(dirname) or dirname in [
-            "bin",
-            "obj",
-            "packages",
-            ".paket",
-            "paket-files",
-            ".fake",
-            ".ionide",
-        ]
+        return dirname in _FSHARP_IGNORED_DIRNAMES or super().is_ignored_dirname(dirname)
 
     @classmethod
-    def _setup_runtime_dependencies(cls, config: LanguageServerConfig, solidlsp_settings: SolidLSPSettings) -> str:
+    def _setup_runtime_dependencies(cls, config: LanguageServerConfig, solidlsp_settings: SolidLSPSettings) -> list[str]:
         """
         Setup runtime dependencies for F# Language Server and return the command to start the server.
         """
         # First check if .NET SDK is installed
-        dotnet_exe = shutil.which("dotnet")
+        dotnet_exe = _find_dotnet_executable()
         if not dotnet_exe:
             raise RuntimeError(
                 ".NET SDK is not installed or not in PATH. Please install .NET SDK 8.0 or later and ensure 'dotnet' is in your PATH."
             )
 
         # Verify dotnet version
-        import subprocess
-
         try:
-            result = subprocess.run([dotnet_exe, "--version"], capture_output=True, text=True, check=True)
-            log.info(f"Found .NET SDK version: {result.stdout.strip()}")
+            log.info(f"Found .NET SDK version: {_get_dotnet_version(dotnet_exe)}")
         except subprocess.CalledProcessError:
             raise RuntimeError("Failed to get .NET SDK version. Please ensure .NET SDK is properly installed.")
 
-        RuntimeDependencyCollection(
-            [
-                RuntimeDependency(
-                    id="fsautocomplete",
-                    description="FsAutoComplete (Ionide F# Language Server)",
-                    command="dotnet tool install --tool-path ./ fsautocomplete",
-                    platform_id="any",
-                ),
-            ]
-        )
-
         # Install FsAutoComplete if not already installed
         fsharp_ls_dir = os.path.join(cls.ls_resources_dir(solidlsp_settings), "fsharp-lsp")
         fsautocomplete_path = os.path.join(fsharp_ls_dir, "fsautocomplete")
@@ -96,172 +332,60 @@ class FSharpLanguageServer(SolidLanguageServer):
         if os.name == "nt":
             fsautocomplete_path += ".exe"
 
-        if not os.path.exists(fsautocomplete_path):
-            log.info(f"FsAutoComplete executable not found at {fsautocomplete_path}. Installing...")
-
-            # Ensure the directory exists
-            os.makedirs(fsharp_ls_dir, exist_ok=True)
-
-            # Install FsAutoComplete using dotnet tool install
+        if fsautocomplete_path not in _verified_fsautocomplete_paths or not os.path.isfile(fsautocomplete_path):
+            _verified_fsautocomplete_paths.discard(fsautocomplete_path)
             try:
-                import subprocess
-
-                result = subprocess.run(
-                    [dotnet_exe, "tool", "install", "--tool-path", fsharp_ls_dir, "fsautocomplete"],
-                    cwd=fsharp_ls_dir,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                log.info("FsAutoComplete installed successfully")
-                log.debug(f"Installation output: {result.stdout}")
-            except subprocess.CalledProcessError as e:
-                log.error(f"Failed to install FsAutoComplete: {e.stderr}")
-                raise RuntimeError(f"Failed to install FsAutoComplete: {e.stderr}")
-
-        if not os.path.exists(fsautocomplete_path):
-            raise FileNotFoundError(
-                f"FsAutoComplete executable not found at {fsautocomplete_path}, something went wrong with the installation."
-            )
-
-        # FsAutoComplete uses --lsp flag for LSP mode
-        return f"{fsautocomplete_path} --adaptive-lsp-server-enabled --project-graph-enabled --use-fcs-transparent-compiler"
+                os.stat(fsautocomplete_path)
+                is_installed = True
+            except OSError:
+                # like os.path.exists, treat any failure (e.g. PermissionError, NotADirectoryError) as not installed
+                is_installed = False
+
+            if not is_installed:
+                log.info(f"FsAutoComplete executable not found at {fsautocomplete_path}. Installing...")
+
+                # Ensure the directory exists
+                os.makedirs(fsharp_ls_dir, exist_ok=True)
+
+                # Install FsAutoComplete using dotnet tool install
+                try:
+                    result = subprocess.run(
+                        [dotnet_exe, "tool", "install", "--tool-path", fsharp_ls_dir, "fsautocomplete"],
+                        cwd=fsharp_ls_dir,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    log.info("FsAutoComplete installed successfully")
+                    log.debug(f"Installation output: {result.stdout}")
+                except subprocess.CalledProcessError as e:
+                    log.error(f"Failed to install FsAutoComplete: {e.stderr}")
+                    raise RuntimeError(f"Failed to install FsAutoComplete: {e.stderr}")
+
+                if not os.path.exists(fsautocomplete_path):
+                    raise FileNotFoundError(
+                        f"FsAutoComplete executable not found at {fsautocomplete_path}, something went wrong with the installation."
+                    )
+
+            _verified_fsautocomplete_paths.add(fsautocomplete_path)
+
+        return [fsautocomplete_path, *_FSAUTOCOMPLETE_ARGS]
 
     def _get_initialize_params(self) -> InitializeParams:
         """
         Returns the initialize params for the F# Language Server.
         """
-        root_uri = pathlib.Path(self.repository_root_path).as_uri()
+        root_uri = Path(self.repository_root_path).as_uri()
 
         initialize_params = {
             "processId": os.getpid(),
             "rootPath": self.repository_root_path,
             "rootUri": root_uri,
             "workspaceFolders": [{"name": "workspace", "uri": root_uri}],
-            "capabilities": {
-                "workspace": {
-                    "applyEdit": True,
-                    "workspaceEdit": {"documentChanges": True},
-                    "didChangeConfiguration": {"dynamicRegistration": True},
-                    "didChangeWatchedFiles": {"dynamicRegistration": True},
-                    "symbol": {"dynamicRegistration": True},
-                    "executeCommand": {"dynamicRegistration": True},
-                    "configuration": True,
-                    "workspaceFolders": True,
-                },
-                "textDocument": {
-                    "synchronization": {
-                        "dynamicRegistration": True,
-                        "willSave": True,
-                        "willSaveWaitUntil": True,
-                        "didSave": True,
-                    },
-                    "completion": {
-                        "dynamicRegistration": True,
-                        "contextSupport": True,
-                        "completionItem": {
-                            "snippetSupport": True,
-                            "commitCharactersSupport": True,
-                            "documentationFormat": ["markdown", "plaintext"],
-                            "deprecatedSupport": True,
-                        },
-                    },
-                    "hover": {
-                        "dynamicRegistration": True,
-                        "contentFormat": ["markdown", "plaintext"],
-                    },
-                    "signatureHelp": {
-                        "dynamicRegistration": True,
-                        "signatureInformation": {"documentationFormat": ["markdown", "plaintext"]},
-                    },
-                    "definition": {"dynamicRegistration": True},
-                    "references": {"dynamicRegistration": True},
-                    "documentHighlight": {"dynamicRegistration": True},
-                    "documentSymbol": {
-                        "dynamicRegistration": True,
-                        "symbolKind": {"valueSet": list(range(1, 26))},  # All SymbolKind values
-                        "hierarchicalDocumentSymbolSupport": True,
-                    },
-                    "codeAction": {
-                        "dynamicRegistration": True,
-                        "codeActionLiteralSupport": {
-                            "codeActionKind": {
-                                "valueSet": [
-                                    "",
-                                    "quickfix",
-                                    "refactor",
-                                    "refactor.extract",
-                                    "refactor.inline",
-                                    "refactor.rewrite",
-                                    "source",
-                                    "source.organizeImports",
-                                ]
-                            }
-                        },
-                    },
-                    "codeLens": {"dynamicRegistration": True},
-                    "formatting": {"dynamicRegistration": True},
-                    "rangeFormatting": {"dynamicRegistration": True},
-                    "onTypeFormatting": {"dynamicRegistration": True},
-                    "rename": {"dynamicRegistration": True},
-                    "documentLink": {"dynamicRegistration": True},
-                    "publishDiagnostics": {
-                        "relatedInformation": True,
-                        "versionSupport": False,
-                        "tagSupport": {"valueSet": [1, 2]},
-                    },
-                    "implementation": {"dynamicRegistration": True},
-                    "typeDefinition": {"dynamicRegistration": True},
-                    "colorProvider": {"dynamicRegistration": True},
-                    "foldingRange": {
-                        "dynamicRegistration": True,
-                        "rangeLimit": 5000,
-                        "lineFoldingOnly": True,
-                    },
-                    "declaration": {"dynamicRegistration": True},
-                    "selectionRange": {"dynamicRegistration": True},
-                },
-                "window": {
-                    "workDoneProgress": True,
-                },
-            },
+            "capabilities": _BASE_CAPABILITIES,
             "initializationOptions": {
-                # F# specific initialization options
-                "automaticWorkspaceInit": True,
-                "abstractClassStubGeneration": True,
-                "abstractClassStubGenerationObjectIdentifier": "this",
-                "abstractClassStubGenerationMethodBody": 'failwith "Not Implemented"',
-                "addFsiWatcher": False,
-                "codeLenses": {"signature": {"enabled": True}, "references": {"enabled": True}},
-                "disableInMemoryProjectReferences": False,
+                **_BASE_INITIALIZATION_OPTIONS,
                 "dotNetRoot": self._get_dotnet_root(),
-                "enableMSBuildProjectGraph": False,
-                "excludeProjectDirectories": ["paket-files"],
-                "externalAutocomplete": False,
-                "fsac": {"attachDebugger": False, "silencedLogs": [], "conserveMemory": False, "netCoreDllPath": ""},
-                "fsiExtraParameters": [],
-                "generateBinlog": False,
-                "interfaceStubGeneration": True,
-                "interfaceStubGenerationObjectIdentifier": "this",
-                "interfaceStubGenerationMethodBody": 'failwith "Not Implemented"',
-                "keywordsAutocomplete": True,
-                "linter": True,
-                "pipelineHints": {"enabled": True},
-                "recordStubGeneration": True,
-                "recordStubGenerationBody": 'failwith "Not Implemented"',
-                "resolveNamespaces": True,
-                "saveOnlyOpenFiles": False,
-                "showProjectExplorerIn": ["ionide", "solution"],
-                "simplifyNameAnalyzer": True,
-                "smartIndent": False,
-                "suggestGitignore": True,
-                "suggestSdkScripts": True,
-                "unionCaseStubGeneration": True,
-                "unionCaseStubGenerationBody": 'failwith "Not Implemented"',
-                "unusedDeclarationsAnalyzer": True,
-                "unusedOpensAnalyzer": True,
-                "verboseLogging": False,
-                "workspaceModePeekDeepLevel": 2,
                 "workspacePath": self.repository_root_path,
             },
             "trace": "off",
@@ -273,26 +397,9 @@ class FSharpLanguageServer(SolidLanguageServer):
         """
         Get the .NET root directory.
         """
-        dotnet_exe = shutil.which("dotnet")
-        if dotnet_exe:
-            # Try to get the installation path
-            try:
-                import subprocess
-
-                result = subprocess.run([dotnet_exe, "--info"], capture_output=True, text=True, check=True)
-                lines = result.stdout.split("\n")
-                for line in lines:
-                    if "Base Path:" in line or "Base path:" in line:
-                        base_path = line.split(":", 1)[1].strip()
-                        # Get the parent directory (remove 'sdk/version' part)
-                        return str(Path(base_path).parent.parent)
-            except (subprocess.CalledProcessError, Exception):
-                pass
-
-        # Fallback: use the directory containing dotnet executable
+        dotnet_exe = _find_dotnet_executable()
         if dotnet_exe:
-            return str(Path(dotnet_exe).parent)
-
+            return _get_dotnet_root_from_info(dotnet_exe)
         return ""
 
     def _start_server(self) -> None:
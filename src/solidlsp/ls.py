@@ -785,31 +785,25 @@ class SolidLanguageServer(ABC):
             log.error("request_text_document_diagnostics called before Language Server started")
             raise SolidLSPException("Language Server not started")
 
+        uri = pathlib.Path(str(PurePath(self.repository_root_path, relative_file_path))).as_uri()
         with self.open_file(relative_file_path):
-            response = self.server.send.text_document_diagnostic(
-                {
-                    LSPConstants.TEXT_DOCUMENT: {  # type: ignore
-                        LSPConstants.URI: pathlib.Path(str(PurePath(self.repository_root_path, relative_file_path))).as_uri()
-                    }
-                }
-            )
+            response = self.server.send.text_document_diagnostic({LSPConstants.TEXT_DOCUMENT: {LSPConstants.URI: uri}})  # type: ignore
 
         if response is None:
             return []  # type: ignore
 
         assert isinstance(response, dict), f"Unexpected response from Language Server (expected list, got {type(response)}): {response}"
-        ret: list[ls_types.Diagnostic] = []
-        for item in response["items"]:  # type: ignore
-            new_item: ls_types.Diagnostic = {
-                "uri": pathlib.Path(str(PurePath(self.repository_root_path, relative_file_path))).as_uri(),
-                "severity": item["severity"],
-                "message": item["message"],
-                "range": item["range"],
-                "code": item["code"],  # type: ignore
-            }
-            ret.append(ls_types.Diagnostic(**new_item))
-
-        return ret
+        # the URI is the same for all items, so it is computed only once (above)
+        return [
+            ls_types.Diagnostic(
+                uri=uri,
+                severity=item["severity"],
+                message=item["message"],
+                range=item["range"],
+                code=item["code"],  # type: ignore
+            )
+            for item in response["items"]  # type: ignore
+        ]
 
     def retrieve_full_file_content(self, file_path: str) -> str:
         """
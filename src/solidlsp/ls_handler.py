@@ -130,6 +130,12 @@ class SolidLanguageServerHandler:
 
     """
 
+    PIPE_BUFFER_SIZE = 64 * 1024
+    """
+    the buffer size for the pipes to the language server process; larger than the default (8 KiB), since
+    responses such as document symbols are frequently larger, which would otherwise require several reads
+    """
+
     def __init__(
         self,
         process_launch_info: ProcessLaunchInfo,
@@ -196,6 +202,7 @@ class SolidLanguageServerHandler:
         kwargs["start_new_session"] = self.start_independent_lsp_process
         self.process = subprocess.Popen(
             cmd,
+            bufsize=self.PIPE_BUFFER_SIZE,
             stdout=subprocess.PIPE,
             stdin=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -496,7 +503,7 @@ class SolidLanguageServerHandler:
         # Use lock to prevent concurrent writes to stdin that cause buffer corruption
         with self._stdin_lock:
             try:
-                self.process.stdin.writelines(msg)
+                self.process.stdin.write(msg)
                 self.process.stdin.flush()
             except (BrokenPipeError, ConnectionResetError, OSError) as e:
                 # Log the error but don't raise to prevent cascading failures
@@ -107,12 +107,18 @@ class StopLoopException(Exception):
     pass
 
 
-def create_message(payload: PayloadLike) -> tuple[bytes, bytes, bytes]:
+def create_message(payload: PayloadLike) -> bytes:
+    """
+    :param payload: the JSON-RPC payload
+    :return: the complete message (headers and body), such that it can be written to the stream in a single call
+    """
     body = json.dumps(payload, check_circular=False, ensure_ascii=False, separators=(",", ":")).encode(ENCODING)
-    return (
-        f"Content-Length: {len(body)}\r\n".encode(ENCODING),
-        "Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n\r\n".encode(ENCODING),
-        body,
+    return b"".join(
+        (
+            f"Content-Length: {len(body)}\r\n".encode(ENCODING),
+            b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n\r\n",
+            body,
+        )
     )
 
 
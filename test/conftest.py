@@ -1,10 +1,14 @@
+import functools
+import itertools
 import logging
 import os
+import threading
 from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
-from blib2to3.pgen2.parse import contextmanager
 from sensai.util.logging import configure
 
 from serena.config.serena_config import SerenaPaths
@@ -15,8 +19,6 @@ from solidlsp.ls import SolidLanguageServer
 from solidlsp.ls_config import Language, LanguageServerConfig
 from solidlsp.settings import SolidLSPSettings
 
-from .solidlsp.clojure import is_clojure_cli_available
-
 configure(level=logging.INFO)
 
 log = logging.getLogger(__name__)
@@ -37,21 +39,60 @@ def get_repo_path(language: Language) -> Path:
     return Path(__file__).parent / "resources" / "repos" / language / "test_repo"
 
 
+_gitignore_patterns_cache: dict[str, tuple[float | None, list[str]]] = {}
+"""
+cache of the gitignore patterns of test repositories, mapping the repository path to the modification time of the
+top-level .gitignore file (None if there is none) and the patterns
+"""
+
+
+def _get_gitignore_patterns(repo_path: str) -> list[str]:
+    """
+    :param repo_path: the repository path
+    :return: the patterns of all gitignore files in the repository (cached as long as the top-level .gitignore does not change)
+    """
+    try:
+        gitignore_mtime: float | None = os.path.getmtime(os.path.join(repo_path, ".gitignore"))
+    except OSError:
+        gitignore_mtime = None
+    cached = _gitignore_patterns_cache.get(repo_path)
+    if cached is not None and cached[0] == gitignore_mtime:
+        return cached[1]
+    patterns = list(itertools.chain.from_iterable(spec.patterns for spec in GitignoreParser(repo_path).get_ignore_specs()))
+    _gitignore_patterns_cache[repo_path] = (gitignore_mtime, patterns)
+    return patterns
+
+
+def _get_project_data_path(repo_path: str) -> str:
+    """
+    :param repo_path: the path of the repository for which a language server is created
+    :return: the path in which the language server stores its project-specific data (i.e. its symbol caches);
+        if symbol caches are persisted, this is the absolute path of the repository's directory in `persisted_symbol_caches_dir`
+        (which pathlib resolves independently of the repository path) for repositories within the test directory
+    """
+    if persist_symbol_caches:
+        try:
+            relative_repo_path = Path(repo_path).resolve().relative_to(Path(__file__).parent)
+        except ValueError:
+            pass  # e.g. a temporary copy of a test repository, whose caches are not worth persisting
+        else:
+            return str(persisted_symbol_caches_dir / relative_repo_path)
+    return SERENA_MANAGED_DIR_NAME
+
+
 def _create_ls(
     language: Language, repo_path: str | None = None, ignored_paths: list[str] | None = None, trace_lsp_communication: bool = False
 ) -> SolidLanguageServer:
     ignored_paths = ignored_paths or []
     if repo_path is None:
         repo_path = str(get_repo_path(language))
-    gitignore_parser = GitignoreParser(str(repo_path))
-    for spec in gitignore_parser.get_ignore_specs():
-        ignored_paths.extend(spec.patterns)
+    ignored_paths.extend(_get_gitignore_patterns(str(repo_path)))
     config = LanguageServerConfig(code_language=language, ignored_paths=ignored_paths, trace_lsp_communication=trace_lsp_communication)
     return SolidLanguageServer.create(
         config,
         repo_path,
         solidlsp_settings=SolidLSPSettings(
-            solidlsp_dir=SerenaPaths().serena_user_home_dir, project_data_relative_path=SERENA_MANAGED_DIR_NAME
+            solidlsp_dir=SerenaPaths().serena_user_home_dir, project_data_relative_path=_get_project_data_path(repo_path)
         ),
     )
 
@@ -68,16 +109,45 @@ def start_ls_context(
         yield ls
     finally:
         log.info(f"Stopping language server for {language} {repo_path}")
+        _stop_ls(ls)
+
+
+persist_symbol_caches = os.getenv("SERENA_TEST_PERSIST_LS_CACHE") == "1"
+"""
+Flag (opt-in via SERENA_TEST_PERSIST_LS_CACHE=1) indicating whether the document symbol caches of language servers
+shall be saved when they are stopped, such that subsequent test sessions can load them instead of querying the language
+server again. The caches are stored in `persisted_symbol_caches_dir` (not within the test repositories) and are
+validated against the files' content hashes, so edits to test repositories invalidate them.
+
+Note that with persisted caches, symbol tests may pass without the language server ever being queried for symbols,
+i.e. such runs no longer exercise the language servers' symbol retrieval; do not enable this to validate language server changes.
+"""
+
+persisted_symbol_caches_dir = Path(__file__).parent.parent / ".pytest_cache" / "solidlsp_symbol_caches"
+"""
+The directory (within pytest's cache directory, which is ignored by git) in which symbol caches are persisted,
+with one subdirectory per test repository (see `persist_symbol_caches`)
+"""
+
+
+def _stop_ls(ls: SolidLanguageServer) -> None:
+    if persist_symbol_caches:
         try:
-            ls.stop(shutdown_timeout=5)
+            ls.save_cache()
         except Exception as e:
-            log.warning(f"Warning: Error stopping language server: {e}")
-            # try to force cleanup
-            if hasattr(ls, "server") and hasattr(ls.server, "process"):
-                try:
-                    ls.server.process.terminate()
-                except:
-                    pass
+            log.warning(f"Warning: Error saving language server cache: {e}")
+    try:
+        ls.stop(shutdown_timeout=5)
+    except Exception as e:
+        log.warning(f"Warning: Error stopping language server: {e}")
+        # try to force cleanup
+        server = getattr(ls, "server", None)
+        process = getattr(server, "process", None) if server is not None else None
+        if process is not None:
+            try:
+                process.terminate()
+            except Exception:
+                pass
 
 
 @contextmanager
@@ -112,9 +182,171 @@ def repo_path(request: LanguageParamRequest) -> Path:
     return get_repo_path(language)
 
 
+reuse_language_servers = os.getenv("SERENA_TEST_REUSE_LS") == "1"
+"""
+Flag indicating whether language servers shall be shared across test modules (see fixture `language_server`).
+Reuse avoids the repeated startup cost of language servers but gives up the isolation between test modules.
+"""
+
+
+_prewarmed_language_servers: dict[Language, Future[SolidLanguageServer]] = {}
+"""
+Language servers which are being started in the background (see `pytest_sessionstart`) and which have not yet been
+taken over by the `language_server` fixture
+"""
+
+prewarm_timeout = float(os.getenv("SERENA_PREWARM_TIMEOUT", "300"))
+"""
+The maximum time (in seconds) to wait for the startup of a pre-warmed language server; if the startup takes longer,
+a fresh language server is started instead (and the pre-warmed one is stopped if its startup completes later on)
+"""
+
+
+def _prewarm_ls(language: Language, future: Future[SolidLanguageServer]) -> None:
+    try:
+        ls = _create_ls(language)
+        log.info(f"Pre-warming language server for {language}")
+        ls.start()
+        future.set_result(ls)
+    except BaseException as e:
+        future.set_exception(e)
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    """
+    Starts the language servers for the languages given in the environment variable SERENA_PREWARM
+    (comma-separated, e.g. SERENA_PREWARM=fsharp,java) in background threads, such that the cold-start
+    cost is (partly) paid while tests are still being collected or other tests are run.
+
+    When running with pytest-xdist, no tests run in the controller process, so servers are pre-warmed
+    only in the worker processes. Note that every worker pre-warms every listed language, whereas
+    (with `--dist=loadgroup`) the tests of a language run in only one of them, so the servers of the other
+    workers remain unused until the end of the session; pre-warming is thus best combined with few workers.
+    """
+    languages = _get_prewarm_languages()
+    config = session.config
+    if getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput"):
+        # this is the xdist controller
+        return
+    for language in languages:
+        if not language_tests_enabled(language) or language in _prewarmed_language_servers:
+            continue
+        future: Future[SolidLanguageServer] = Future()
+        _prewarmed_language_servers[language] = future
+        threading.Thread(target=_prewarm_ls, args=(language, future), name=f"prewarm-ls-{language}", daemon=True).start()
+
+
+def _get_prewarm_languages() -> list[Language]:
+    """
+    :return: the languages given in the environment variable SERENA_PREWARM
+    :raises pytest.UsageError: if the variable contains an entry that is not a language
+    """
+    languages = []
+    for language_name in os.getenv("SERENA_PREWARM", "").split(","):
+        language_name = language_name.strip()
+        if not language_name:
+            continue
+        try:
+            languages.append(Language(language_name))
+        except ValueError:
+            raise pytest.UsageError(
+                f"Invalid entry '{language_name}' in SERENA_PREWARM; valid values are: {', '.join(lang.value for lang in Language)}"
+            ) from None
+    return languages
+
+
+_language_marker_names = frozenset(language.value for language in Language)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """
+    Assigns each test that is marked with a language marker (and which does not define an explicit group)
+    to the pytest-xdist group of that language, such that, when running with `-n <workers> --dist=loadgroup`,
+    all tests of a language run in the same worker (sharing its language servers) while different languages
+    are tested in parallel.
+    """
+    for item in items:
+        if item.get_closest_marker("xdist_group") is not None:
+            continue
+        language_marker = next((m for m in item.iter_markers() if m.name in _language_marker_names), None)
+        if language_marker is not None:
+            item.add_marker(pytest.mark.xdist_group(name=f"{language_marker.name}-ls"))
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    # stop any pre-warmed language servers that were never used (without waiting for startups that are still in progress)
+    for future in _prewarmed_language_servers.values():
+        _discard_prewarmed_ls(future)
+    _prewarmed_language_servers.clear()
+
+
+def _discard_prewarmed_ls(future: Future[SolidLanguageServer]) -> None:
+    """
+    Stops the pre-warmed language server as soon as its startup has completed (immediately, if it already has).
+    """
+
+    def stop(f: Future[SolidLanguageServer]) -> None:
+        if f.exception() is None:
+            _stop_ls(f.result())
+
+    future.add_done_callback(stop)
+
+
+def _take_prewarmed_ls(language: Language) -> SolidLanguageServer | None:
+    """
+    Takes over the pre-warmed language server for the given language (if any), waiting for its startup to complete.
+
+    :param language: the language
+    :return: the started language server or None if no server was pre-warmed for the language
+        (or its startup failed or did not complete within `prewarm_timeout`)
+    """
+    future = _prewarmed_language_servers.pop(language, None)
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=prewarm_timeout)
+    except TimeoutError:
+        log.warning(f"Pre-warming of language server for {language} did not complete within {prewarm_timeout}s, starting it anew")
+        _discard_prewarmed_ls(future)
+        return None
+    except Exception as e:
+        log.warning(f"Pre-warming of language server for {language} failed, starting it anew: {e}")
+        return None
+
+
+@pytest.fixture(scope="session")
+def _ls_pool() -> Iterator[dict[tuple[Language, str], SolidLanguageServer]]:
+    """
+    Session-wide pool of started language servers (keyed by language and repository path),
+    which is used by the `language_server` fixture if `reuse_language_servers` is enabled.
+    All pooled language servers are stopped at the end of the session.
+    """
+    pool: dict[tuple[Language, str], SolidLanguageServer] = {}
+    yield pool
+    for (language, repo_path), ls in pool.items():
+        log.info(f"Stopping pooled language server for {language} {repo_path}")
+        _stop_ls(ls)
+
+
+def _get_pooled_ls(pool: dict[tuple[Language, str], SolidLanguageServer], language: Language) -> SolidLanguageServer:
+    repo_path = str(get_repo_path(language))
+    key = (language, repo_path)
+    ls = pool.get(key)
+    if ls is None or not ls.is_running():
+        ls = _take_prewarmed_ls(language)
+        if ls is None:
+            ls = _create_ls(language, repo_path)
+            log.info(f"Starting pooled language server for {language} {repo_path}")
+            ls.start()
+        pool[key] = ls
+    return ls
+
+
 # Note: using module scope here to avoid restarting LS for each test function but still terminate between test modules
+# (unless reuse_language_servers is enabled, in which case language servers are shared across modules)
 @pytest.fixture(scope="module")
-def language_server(request: LanguageParamRequest):
+def language_server(request: LanguageParamRequest, _ls_pool: dict[tuple[Language, str], SolidLanguageServer]):
     """Create a language server instance configured for the specified language.
 
     This fixture requires a language parameter via pytest.mark.parametrize:
@@ -140,8 +372,19 @@ def language_server(request: LanguageParamRequest):
         raise ValueError("Language parameter must be provided via pytest.mark.parametrize")
 
     language = request.param
-    with start_default_ls_context(language) as ls:
-        yield ls
+    if reuse_language_servers:
+        yield _get_pooled_ls(_ls_pool, language)
+        return
+    prewarmed_ls = _take_prewarmed_ls(language)
+    if prewarmed_ls is not None:
+        try:
+            yield prewarmed_ls
+        finally:
+            log.info(f"Stopping pre-warmed language server for {language}")
+            _stop_ls(prewarmed_ls)
+    else:
+        with start_default_ls_context(language) as ls:
+            yield ls
 
 
 @pytest.fixture(scope="module")
@@ -182,12 +425,16 @@ Flag indicating whether the tests are running in the GitHub CI environment.
 """
 
 
-def _determine_disabled_languages() -> list[Language]:
+@functools.cache
+def _determine_disabled_languages() -> frozenset[Language]:
     """
-    Determine which language tests should be disabled (based on the environment)
+    Determine which language tests should be disabled (based on the environment).
+    This is done on first use only, as it may require external tools to be invoked (e.g. the Clojure CLI).
 
-    :return: the list of disabled languages
+    :return: the set of disabled languages
     """
+    from .solidlsp.clojure import is_clojure_cli_available
+
     result: list[Language] = []
 
     java_tests_enabled = True
@@ -202,10 +449,7 @@ def _determine_disabled_languages() -> list[Language]:
     if not al_tests_enabled:
         result.append(Language.AL)
 
-    return result
-
-
-_disabled_languages = _determine_disabled_languages()
+    return frozenset(result)
 
 
 def language_tests_enabled(language: Language) -> bool:
@@ -215,4 +459,4 @@ def language_tests_enabled(language: Language) -> bool:
     :param language: the language to check
     :return: True if tests for the language are enabled, False otherwise
     """
-    return language not in _disabled_languages
+    return language not in _determine_disabled_languages()
@@ -0,0 +1,97 @@
+import shutil
+from dataclasses import dataclass, field
+
+import pytest
+
+from serena.util.general import get_dataclass_default, load_yaml, save_yaml
+
+
+class TestLoadYaml:
+    """Test class for load_yaml."""
+
+    @pytest.mark.parametrize(
+        ("scalar", "expected"),
+        [
+            ("no", "no"),
+            ("NO", "NO"),
+            ("on", "on"),
+            ("0755", 755),
+            ("0o755", 0o755),
+            ("1:30", "1:30"),
+            ("true", True),
+        ],
+    )
+    @pytest.mark.parametrize("preserve_comments", [False, True])
+    def test_yaml_1_2_scalars(self, tmp_path, scalar, expected, preserve_comments):
+        """Test that plain scalars are resolved according to YAML 1.2 (not 1.1), with and without comment preservation."""
+        path = tmp_path / "config.yml"
+        path.write_text(f"value: {scalar}\n", encoding="utf-8")
+
+        assert load_yaml(str(path), preserve_comments=preserve_comments)["value"] == expected
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Test that strings which YAML 1.1 would resolve to other types survive saving and loading."""
+        path = str(tmp_path / "config.yml")
+        data = {"flag": "no", "mode": "0755", "time": "1:30", "enabled": False, "count": 755}
+        save_yaml(path, data)
+
+        assert load_yaml(path, preserve_comments=False) == data
+
+    def test_loaded_data_is_not_shared_between_calls(self, tmp_path):
+        """Test that modifying the loaded data does not affect subsequent loads."""
+        path = str(tmp_path / "config.yml")
+        save_yaml(path, {"name": "test", "items": [1, 2]})
+
+        data = load_yaml(path, preserve_comments=False)
+        data["items"].append(3)
+
+        assert load_yaml(path, preserve_comments=False) == {"name": "test", "items": [1, 2]}
+
+    def test_rewritten_file_is_reloaded(self, tmp_path):
+        """Test that loading a file after rewriting it (with content of the same size) returns the new content."""
+        path = str(tmp_path / "config.yml")
+        save_yaml(path, {"name": "old"})
+        assert load_yaml(path, preserve_comments=False) == {"name": "old"}
+
+        save_yaml(path, {"name": "new"})
+
+        assert load_yaml(path, preserve_comments=False) == {"name": "new"}
+
+
+class TestSaveYaml:
+    """Test class for save_yaml."""
+
+    def test_save_after_directory_removal(self, tmp_path):
+        """Test that saving still works if the target directory is removed after a previous save."""
+        dir_path = tmp_path / "configs"
+        path = str(dir_path / "config.yml")
+        save_yaml(path, {"name": "first"})
+        shutil.rmtree(dir_path)
+
+        save_yaml(path, {"name": "second"})
+
+        assert load_yaml(path, preserve_comments=False) == {"name": "second"}
+
+
+@dataclass
+class _ConfigWithDefaults:
+    required: str
+    name: str = "default"
+    items: list[str] = field(default_factory=list)
+
+
+class TestGetDataclassDefault:
+    """Test class for get_dataclass_default."""
+
+    def test_default_value(self):
+        assert get_dataclass_default(_ConfigWithDefaults, "name") == "default"
+
+    def test_default_factory_is_invoked_per_call(self):
+        """Test that mutable defaults obtained from a default factory are not shared between calls."""
+        items = get_dataclass_default(_ConfigWithDefaults, "items")
+        assert items == []
+        assert get_dataclass_default(_ConfigWithDefaults, "items") is not items
+
+    def test_no_default(self):
+        with pytest.raises(AttributeError):
+            get_dataclass_default(_ConfigWithDefaults, "required")
@@ -1,21 +1,19 @@
+import functools
 from pathlib import Path
 
 from solidlsp.language_servers.clojure_lsp import verify_clojure_cli
 
 
-def _test_clojure_cli() -> bool:
+@functools.cache
+def is_clojure_cli_available() -> bool:
     try:
         verify_clojure_cli()
-        return False
-    except (FileNotFoundError, RuntimeError):
         return True
+    except (FileNotFoundError, RuntimeError):
+        return False
 
 
-CLI_FAIL = _test_clojure_cli()
+CLI_FAIL = not is_clojure_cli_available()
 TEST_APP_PATH = Path("src") / "test_app"
 CORE_PATH = str(TEST_APP_PATH / "core.clj")
 UTILS_PATH = str(TEST_APP_PATH / "utils.clj")
-
-
-def is_clojure_cli_available() -> bool:
-    return not CLI_FAIL
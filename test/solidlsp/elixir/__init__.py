@@ -1,5 +1,13 @@
-def _test_expert_available() -> str:
-    """Test if Expert is available and return error reason if not."""
+import functools
+
+
+@functools.cache
+def expert_unavailable_reason() -> str:
+    """Test if Expert is available and return error reason if not.
+
+    The check is performed lazily (see `pytest_runtest_setup` in this package's conftest), such that the
+    Elixir installation is only probed if Elixir tests are actually run.
+    """
     # Try to import and check Elixir availability
     try:
         from solidlsp.language_servers.elixir_tools.elixir_tools import ElixirTools
@@ -15,7 +23,3 @@ def _test_expert_available() -> str:
         return f"Failed to import ElixirTools: {e}"
     except Exception as e:
         return f"Error checking Expert availability: {e}"
-
-
-EXPERT_UNAVAILABLE_REASON = _test_expert_available()
-EXPERT_UNAVAILABLE = bool(EXPERT_UNAVAILABLE_REASON)
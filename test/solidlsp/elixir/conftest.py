@@ -9,6 +9,8 @@ from pathlib import Path
 
 import pytest
 
+from . import expert_unavailable_reason
+
 
 def ensure_elixir_test_repo_compiled(repo_path: str) -> None:
     """Ensure the Elixir test repository dependencies are installed and project is compiled.
@@ -144,6 +146,17 @@ def ensure_elixir_test_repo_compiled(repo_path: str) -> None:
         print(f"❌ ERROR: Failed to prepare Elixir test repository: {e}")
 
 
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    """Skip the Elixir tests if Expert is not available.
+
+    The availability is only determined once the first Elixir test is set up (rather than at import/collection time),
+    such that no subprocess is spawned if no Elixir tests are run.
+    """
+    reason = expert_unavailable_reason()
+    if reason:
+        pytest.skip(f"Expert not available: {reason}")
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_elixir_test_environment():
     """Automatically prepare Elixir test environment for all Elixir tests.
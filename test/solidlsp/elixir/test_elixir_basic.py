@@ -12,10 +12,8 @@ import pytest
 from solidlsp import SolidLanguageServer
 from solidlsp.ls_config import Language
 
-from . import EXPERT_UNAVAILABLE, EXPERT_UNAVAILABLE_REASON
-
 # These marks will be applied to all tests in this module
-pytestmark = [pytest.mark.elixir, pytest.mark.skipif(EXPERT_UNAVAILABLE, reason=f"Next LS not available: {EXPERT_UNAVAILABLE_REASON}")]
+pytestmark = [pytest.mark.elixir]  # tests are skipped if Expert is unavailable, see conftest.py
 
 
 class TestElixirBasic:
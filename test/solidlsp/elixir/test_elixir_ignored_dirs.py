@@ -1,6 +1,5 @@
 import os
 from collections.abc import Generator
-from pathlib import Path
 
 import pytest
 
@@ -8,10 +7,8 @@ from solidlsp import SolidLanguageServer
 from solidlsp.ls_config import Language
 from test.conftest import start_ls_context
 
-from . import EXPERT_UNAVAILABLE, EXPERT_UNAVAILABLE_REASON
-
 # These marks will be applied to all tests in this module
-pytestmark = [pytest.mark.elixir, pytest.mark.skipif(EXPERT_UNAVAILABLE, reason=f"Expert not available: {EXPERT_UNAVAILABLE_REASON}")]
+pytestmark = [pytest.mark.elixir]  # tests are skipped if Expert is unavailable, see conftest.py
 
 # Skip slow tests in CI - they require multiple Expert instances which is too slow
 IN_CI = bool(os.environ.get("CI") or os.environ.get("GITHUB_ACTIONS"))
@@ -21,24 +18,34 @@ SKIP_SLOW_IN_CI = pytest.mark.skipif(
 )
 
 
+IGNORED_PATHS_LITERAL = ("scripts", "ignored_dir")
+IGNORED_PATHS_GLOB = ("*cripts", "ignored_*")  # codespell:ignore cripts
+WITH_IGNORED_PATHS = pytest.mark.parametrize(
+    "ls_with_ignored_dirs", [IGNORED_PATHS_LITERAL, IGNORED_PATHS_GLOB], ids=["literal", "glob"], indirect=True
+)
+
+
 @pytest.fixture(scope="session")
-def ls_with_ignored_dirs() -> Generator[SolidLanguageServer, None, None]:
-    """Fixture to set up an LS for the elixir test repo with the 'scripts' directory ignored.
+def ls_with_ignored_dirs(request: pytest.FixtureRequest) -> Generator[SolidLanguageServer, None, None]:
+    """Fixture to set up an LS for the elixir test repo with the 'scripts' and 'ignored_dir' directories ignored.
 
+    The ignored paths are passed via indirect parametrization (defaulting to the literal directory names).
     Uses session scope to avoid restarting Expert for each test.
     """
-    ignored_paths = ["scripts", "ignored_dir"]
+    ignored_paths = list(getattr(request, "param", IGNORED_PATHS_LITERAL))
     with start_ls_context(language=Language.ELIXIR, ignored_paths=ignored_paths) as ls:
         yield ls
 
 
 @pytest.mark.slow
 @SKIP_SLOW_IN_CI
-def test_symbol_tree_ignores_dir(ls_with_ignored_dirs: SolidLanguageServer):
-    """Tests that request_full_symbol_tree ignores the configured directory.
+@WITH_IGNORED_PATHS
+def test_symbol_tree_ignores_dirs(ls_with_ignored_dirs: SolidLanguageServer):
+    """Tests that request_full_symbol_tree ignores the configured directories,
+    both for literal directory names and glob patterns.
 
-    Note: This test uses a separate Expert instance with custom ignored paths,
-    which adds ~60-90s startup time.
+    Note: Each parametrization uses a separate Expert instance with custom ignored paths,
+    which adds ~60-90s startup time (the instances are shared with `test_find_references_ignores_dirs`).
     """
     root = ls_with_ignored_dirs.request_full_symbol_tree()[0]
     root_children = root["children"]
@@ -53,11 +60,13 @@ def test_symbol_tree_ignores_dir(ls_with_ignored_dirs: SolidLanguageServer):
 
 @pytest.mark.slow
 @SKIP_SLOW_IN_CI
-def test_find_references_ignores_dir(ls_with_ignored_dirs: SolidLanguageServer):
-    """Tests that find_references ignores the configured directory.
+@WITH_IGNORED_PATHS
+def test_find_references_ignores_dirs(ls_with_ignored_dirs: SolidLanguageServer):
+    """Tests that request_references ignores the configured directories,
+    both for literal directory names and glob patterns.
 
-    Note: This test uses a separate Expert instance with custom ignored paths,
-    which adds ~60-90s startup time.
+    Note: Each parametrization uses a separate Expert instance with custom ignored paths,
+    which adds ~60-90s startup time (the instances are shared with `test_symbol_tree_ignores_dirs`).
     """
     # Location of User struct, which is referenced in scripts and ignored_dir
     definition_file = "lib/models.ex"
@@ -81,49 +90,6 @@ def test_find_references_ignores_dir(ls_with_ignored_dirs: SolidLanguageServer):
     assert not any("ignored_dir" in ref["relativePath"] for ref in references), "ignored_dir should be ignored"
 
 
-@pytest.mark.slow
-@SKIP_SLOW_IN_CI
-@pytest.mark.parametrize("repo_path", [Language.ELIXIR], indirect=True)
-def test_refs_and_symbols_with_glob_patterns(repo_path: Path) -> None:
-    """Tests that refs and symbols with glob patterns are ignored.
-
-    Note: This test uses a separate Expert instance with custom ignored paths,
-    which adds ~60-90s startup time.
-    """
-    ignored_paths = ["*cripts", "ignored_*"]  # codespell:ignore cripts
-    with start_ls_context(language=Language.ELIXIR, repo_path=str(repo_path), ignored_paths=ignored_paths) as ls:
-
-        # Same as in the above tests
-        root = ls.request_full_symbol_tree()[0]
-        root_children = root["children"]
-        children_names = {child["name"] for child in root_children}
-
-        # Should have lib and test directories, but not scripts or ignored_dir
-        expected_dirs = {"lib", "test"}
-        assert expected_dirs.issubset(children_names), f"Expected {expected_dirs} to be in {children_names}"
-        assert "scripts" not in children_names, f"scripts should not be in {children_names} (glob pattern)"
-        assert "ignored_dir" not in children_names, f"ignored_dir should not be in {children_names} (glob pattern)"
-
-        # Test that the refs and symbols with glob patterns are ignored
-        definition_file = "lib/models.ex"
-
-        # Find the User struct definition
-        symbols = ls.request_document_symbols(definition_file).get_all_symbols_and_roots()
-        user_symbol = None
-        for symbol_group in symbols:
-            user_symbol = next((s for s in symbol_group if "User" in s.get("name", "")), None)
-            if user_symbol:
-                break
-
-        if user_symbol and "selectionRange" in user_symbol:
-            sel_start = user_symbol["selectionRange"]["start"]
-            references = ls.request_references(definition_file, sel_start["line"], sel_start["character"])
-
-            # Assert that scripts and ignored_dir do not appear in references
-            assert not any("scripts" in ref["relativePath"] for ref in references), "scripts should be ignored (glob)"
-            assert not any("ignored_dir" in ref["relativePath"] for ref in references), "ignored_dir should be ignored (glob)"
-
-
 @pytest.mark.parametrize("language_server", [Language.ELIXIR], indirect=True)
 def test_default_ignored_directories(language_server: SolidLanguageServer):
     """Test that default Elixir directories are ignored."""
@@ -15,10 +15,8 @@ from solidlsp import SolidLanguageServer
 from solidlsp.ls_config import Language
 from solidlsp.ls_types import SymbolKind
 
-from . import EXPERT_UNAVAILABLE, EXPERT_UNAVAILABLE_REASON
-
 # These marks will be applied to all tests in this module
-pytestmark = [pytest.mark.elixir, pytest.mark.skipif(EXPERT_UNAVAILABLE, reason=f"Next LS not available: {EXPERT_UNAVAILABLE_REASON}")]
+pytestmark = [pytest.mark.elixir]  # tests are skipped if Expert is unavailable, see conftest.py
 
 
 class TestElixirLanguageServerSymbols:
@@ -7,7 +7,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from solidlsp import SolidLanguageServer
-from solidlsp.language_servers.fsharp_language_server import FSharpLanguageServer
+from solidlsp.language_servers.fsharp_language_server import FSharpLanguageServer, clear_dotnet_caches
 from solidlsp.ls_config import Language
 from solidlsp.ls_utils import SymbolUtils
 
@@ -185,6 +185,11 @@ class TestFSharpLanguageServer:
 class TestFSharpLanguageServerSetup:
     """Test F# language server setup and configuration."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_dotnet_caches(self) -> None:
+        """Ensures that the dotnet location and results cached by earlier tests (e.g. for a real installation) do not affect the mocked setup."""
+        clear_dotnet_caches()
+
     def test_runtime_dependency_setup_without_dotnet(self) -> None:
         """Test that setup fails gracefully when .NET is not installed."""
         with patch("shutil.which", return_value=None):
@@ -215,5 +220,33 @@ class TestFSharpLanguageServerSetup:
 
                         result = FSharpLanguageServer._setup_runtime_dependencies(mock_config, mock_settings)
 
-                        assert fsautocomplete_path in result
-                        assert "--adaptive-lsp-server-enabled --project-graph-enabled --use-fcs-transparent-compiler" in result
+                        assert result == [
+                            fsautocomplete_path,
+                            "--adaptive-lsp-server-enabled",
+                            "--project-graph-enabled",
+                            "--use-fcs-transparent-compiler",
+                        ]
+
+    def test_runtime_dependency_setup_reinstalls_removed_fsautocomplete(self) -> None:
+        """Test that an FsAutoComplete installation which was removed after a successful setup is installed anew."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("shutil.which", return_value="/usr/bin/dotnet"):
+                with patch.object(FSharpLanguageServer, "ls_resources_dir", return_value=temp_dir):
+                    with patch("subprocess.run") as mock_run:
+                        mock_run.return_value.stdout = "8.0.100"
+                        mock_run.return_value.returncode = 0
+
+                        fsharp_dir = os.path.join(temp_dir, "fsharp-lsp")
+                        os.makedirs(fsharp_dir, exist_ok=True)
+                        exe_name = "fsautocomplete.exe" if os.name == "nt" else "fsautocomplete"
+                        fsautocomplete_path = os.path.join(fsharp_dir, exe_name)
+                        Path(fsautocomplete_path).touch()
+                        FSharpLanguageServer._setup_runtime_dependencies(Mock(), Mock())
+
+                        os.remove(fsautocomplete_path)
+                        mock_run.reset_mock()
+
+                        # the (mocked) installation does not create the executable
+                        with pytest.raises(FileNotFoundError, match="something went wrong with the installation"):
+                            FSharpLanguageServer._setup_runtime_dependencies(Mock(), Mock())
+                        assert any("install" in call.args[0] for call in mock_run.call_args_list), "FsAutoComplete should be reinstalled"
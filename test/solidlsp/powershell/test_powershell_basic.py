@@ -5,57 +5,95 @@ These tests validate the functionality of the language server APIs
 like request_document_symbols using the PowerShell test repository.
 """
 
+import re
+
 import pytest
 
 from solidlsp import SolidLanguageServer
 from solidlsp.ls_config import Language
+from solidlsp.ls_types import UnifiedSymbolInformation
+
+FUNCTION_NAME_PATTERN = re.compile(r"^(?:function\s+)?([\w-]+)")
+"""matches the bare function name in PSES symbol names, which have the format `function FuncName ()`"""
+
+
+def get_function_symbols(symbols: list[UnifiedSymbolInformation]) -> list[UnifiedSymbolInformation]:
+    """
+    :param symbols: the symbols to search
+    :return: all function symbols (LSP Symbol Kind 12)
+    """
+    return [s for s in symbols if s.get("kind") == 12]
+
+
+def get_function_name(symbol: UnifiedSymbolInformation) -> str | None:
+    """
+    :param symbol: a function symbol
+    :return: the bare function name or None if the symbol name does not start with one
+    """
+    m = FUNCTION_NAME_PATTERN.match(symbol["name"])
+    return m.group(1) if m else None
+
+
+def get_function_names(symbols: list[UnifiedSymbolInformation]) -> set[str]:
+    """
+    :param symbols: the symbols to search
+    :return: the bare names of all function symbols
+    """
+    return {name for s in get_function_symbols(symbols) if (name := get_function_name(s)) is not None}
+
+
+def find_function_symbol(symbols: list[UnifiedSymbolInformation], name: str) -> UnifiedSymbolInformation | None:
+    """
+    :param symbols: the symbols to search
+    :param name: the bare function name
+    :return: the first function symbol with exactly the given bare name or None if there is no such symbol
+    """
+    return next((s for s in get_function_symbols(symbols) if get_function_name(s) == name), None)
+
+
+@pytest.fixture(scope="module")
+def main_symbols(language_server: SolidLanguageServer) -> list[UnifiedSymbolInformation]:
+    """All symbols in main.ps1, requested once per module."""
+    all_symbols, _root_symbols = language_server.request_document_symbols("main.ps1").get_all_symbols_and_roots()
+    return all_symbols
+
+
+@pytest.fixture(scope="module")
+def utils_symbols(language_server: SolidLanguageServer) -> list[UnifiedSymbolInformation]:
+    """All symbols in utils.ps1, requested once per module."""
+    all_symbols, _root_symbols = language_server.request_document_symbols("utils.ps1").get_all_symbols_and_roots()
+    return all_symbols
 
 
 @pytest.mark.powershell
+@pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
 class TestPowerShellLanguageServerBasics:
     """Test basic functionality of the PowerShell language server."""
 
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
     def test_powershell_language_server_initialization(self, language_server: SolidLanguageServer) -> None:
         """Test that PowerShell language server can be initialized successfully."""
         assert language_server is not None
         assert language_server.language == Language.POWERSHELL
 
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
-    def test_powershell_request_document_symbols(self, language_server: SolidLanguageServer) -> None:
-        """Test request_document_symbols for PowerShell files."""
-        # Test getting symbols from main.ps1
-        all_symbols, _root_symbols = language_server.request_document_symbols("main.ps1").get_all_symbols_and_roots()
-
-        # Extract function symbols (LSP Symbol Kind 12)
-        function_symbols = [symbol for symbol in all_symbols if symbol.get("kind") == 12]
-        function_names = [symbol["name"] for symbol in function_symbols]
-
-        # PSES returns function names in format "function FuncName ()" - check for function name substring
-        def has_function(name: str) -> bool:
-            return any(name in fn for fn in function_names)
-
-        # Should detect the main functions from main.ps1
-        assert has_function("Greet-User"), f"Should find Greet-User function in {function_names}"
-        assert has_function("Process-Items"), f"Should find Process-Items function in {function_names}"
-        assert has_function("Main"), f"Should find Main function in {function_names}"
-        assert len(function_symbols) >= 3, f"Should find at least 3 functions, found {len(function_symbols)}"
-
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
-    def test_powershell_utils_functions(self, language_server: SolidLanguageServer) -> None:
+    @pytest.mark.parametrize(
+        "function_name",
+        [
+            "Greet-User",  # has CmdletBinding and parameters
+            "Process-Items",  # has an array parameter
+            "Main",
+        ],
+    )
+    def test_powershell_main_function_detected(self, main_symbols: list[UnifiedSymbolInformation], function_name: str) -> None:
+        """Test that request_document_symbols detects the functions in main.ps1, including functions with parameters."""
+        function_symbol = find_function_symbol(main_symbols, function_name)
+        assert function_symbol is not None, f"Should find {function_name} function in {get_function_names(main_symbols)}"
+
+    def test_powershell_utils_functions(self, utils_symbols: list[UnifiedSymbolInformation]) -> None:
         """Test function detection in utils.ps1 file."""
-        # Test with utils.ps1
-        utils_all_symbols, _utils_root_symbols = language_server.request_document_symbols("utils.ps1").get_all_symbols_and_roots()
-
-        utils_function_symbols = [symbol for symbol in utils_all_symbols if symbol.get("kind") == 12]
-        utils_function_names = [symbol["name"] for symbol in utils_function_symbols]
-
-        # PSES returns function names in format "function FuncName ()" - check for function name substring
-        def has_function(name: str) -> bool:
-            return any(name in fn for fn in utils_function_names)
+        utils_function_names = get_function_names(utils_symbols)
 
         # Should detect functions from utils.ps1
-        expected_utils_functions = [
+        expected_utils_functions = {
             "Convert-ToUpperCase",
             "Convert-ToLowerCase",
             "Remove-Whitespace",
@@ -64,56 +102,27 @@ class TestPowerShellLanguageServerBasics:
             "Write-LogMessage",
             "Test-ValidEmail",
             "Test-IsNumber",
-        ]
-
-        for func_name in expected_utils_functions:
-            assert has_function(func_name), f"Should find {func_name} function in utils.ps1, got {utils_function_names}"
+        }
+        missing_functions = expected_utils_functions - utils_function_names
+        assert not missing_functions, f"Should find {missing_functions} in utils.ps1, got {utils_function_names}"
 
+        utils_function_symbols = get_function_symbols(utils_symbols)
         assert len(utils_function_symbols) >= 8, f"Should find at least 8 functions in utils.ps1, found {len(utils_function_symbols)}"
 
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
-    def test_powershell_function_with_parameters(self, language_server: SolidLanguageServer) -> None:
-        """Test that functions with CmdletBinding and parameters are detected correctly."""
-        all_symbols, _root_symbols = language_server.request_document_symbols("main.ps1").get_all_symbols_and_roots()
-
-        function_symbols = [symbol for symbol in all_symbols if symbol.get("kind") == 12]
-
-        # Find Greet-User function which has parameters
-        # PSES returns function names in format "function FuncName ()"
-        greet_user_symbol = next((sym for sym in function_symbols if "Greet-User" in sym["name"]), None)
-        assert greet_user_symbol is not None, f"Should find Greet-User function in {[s['name'] for s in function_symbols]}"
-
-        # Find Process-Items function which has array parameter
-        process_items_symbol = next((sym for sym in function_symbols if "Process-Items" in sym["name"]), None)
-        assert process_items_symbol is not None, f"Should find Process-Items function in {[s['name'] for s in function_symbols]}"
-
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
-    def test_powershell_all_function_detection(self, language_server: SolidLanguageServer) -> None:
+    def test_powershell_all_function_detection(
+        self, main_symbols: list[UnifiedSymbolInformation], utils_symbols: list[UnifiedSymbolInformation]
+    ) -> None:
         """Test that all expected functions are detected across both files."""
-        # Get symbols from main.ps1
-        main_all_symbols, _main_root_symbols = language_server.request_document_symbols("main.ps1").get_all_symbols_and_roots()
-        main_functions = [symbol for symbol in main_all_symbols if symbol.get("kind") == 12]
-        main_function_names = [func["name"] for func in main_functions]
-
-        # Get symbols from utils.ps1
-        utils_all_symbols, _utils_root_symbols = language_server.request_document_symbols("utils.ps1").get_all_symbols_and_roots()
-        utils_functions = [symbol for symbol in utils_all_symbols if symbol.get("kind") == 12]
-        utils_function_names = [func["name"] for func in utils_functions]
-
-        # PSES returns function names in format "function FuncName ()" - check for function name substring
-        def has_main_function(name: str) -> bool:
-            return any(name in fn for fn in main_function_names)
-
-        def has_utils_function(name: str) -> bool:
-            return any(name in fn for fn in utils_function_names)
+        main_function_names = get_function_names(main_symbols)
+        utils_function_names = get_function_names(utils_symbols)
 
         # Verify main.ps1 functions
-        expected_main = ["Greet-User", "Process-Items", "Main"]
-        for expected_func in expected_main:
-            assert has_main_function(expected_func), f"Should detect {expected_func} function in main.ps1, got {main_function_names}"
+        expected_main = {"Greet-User", "Process-Items", "Main"}
+        missing_main = expected_main - main_function_names
+        assert not missing_main, f"Should detect {missing_main} in main.ps1, got {main_function_names}"
 
         # Verify utils.ps1 functions
-        expected_utils = [
+        expected_utils = {
             "Convert-ToUpperCase",
             "Convert-ToLowerCase",
             "Remove-Whitespace",
@@ -122,26 +131,25 @@ class TestPowerShellLanguageServerBasics:
             "Write-LogMessage",
             "Test-ValidEmail",
             "Test-IsNumber",
-        ]
-        for expected_func in expected_utils:
-            assert has_utils_function(expected_func), f"Should detect {expected_func} function in utils.ps1, got {utils_function_names}"
+        }
+        missing_utils = expected_utils - utils_function_names
+        assert not missing_utils, f"Should detect {missing_utils} in utils.ps1, got {utils_function_names}"
 
         # Verify total counts
-        assert len(main_functions) >= 3, f"Should find at least 3 functions in main.ps1, found {len(main_functions)}"
-        assert len(utils_functions) >= 8, f"Should find at least 8 functions in utils.ps1, found {len(utils_functions)}"
+        main_function_symbols = get_function_symbols(main_symbols)
+        utils_function_symbols = get_function_symbols(utils_symbols)
+        assert len(main_function_symbols) >= 3, f"Should find at least 3 functions in main.ps1, found {len(main_function_symbols)}"
+        assert len(utils_function_symbols) >= 8, f"Should find at least 8 functions in utils.ps1, found {len(utils_function_symbols)}"
 
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
-    def test_powershell_find_references_within_file(self, language_server: SolidLanguageServer) -> None:
+    def test_powershell_find_references_within_file(
+        self, language_server: SolidLanguageServer, main_symbols: list[UnifiedSymbolInformation]
+    ) -> None:
         """Test finding references to a function within the same file."""
         main_path = "main.ps1"
 
-        # Get symbols to find the Greet-User function which is called from Main
-        all_symbols, _root_symbols = language_server.request_document_symbols(main_path).get_all_symbols_and_roots()
-
-        # Find Greet-User function definition
-        function_symbols = [s for s in all_symbols if s.get("kind") == 12]
-        greet_user_symbol = next((s for s in function_symbols if "Greet-User" in s["name"]), None)
-        assert greet_user_symbol is not None, f"Should find Greet-User function in {[s['name'] for s in function_symbols]}"
+        # Find Greet-User function definition, which is called from Main
+        greet_user_symbol = find_function_symbol(main_symbols, "Greet-User")
+        assert greet_user_symbol is not None, f"Should find Greet-User function in {get_function_names(main_symbols)}"
 
         # Find references to Greet-User (should be called from Main function at line 91)
         sel_start = greet_user_symbol["selectionRange"]["start"]
@@ -153,17 +161,20 @@ class TestPowerShellLanguageServerBasics:
             "main.ps1" in ref.get("uri", ref.get("relativePath", "")) for ref in refs
         ), f"Should find reference in main.ps1, got {refs}"
 
-    @pytest.mark.parametrize("language_server", [Language.POWERSHELL], indirect=True)
     def test_powershell_find_definition_across_files(self, language_server: SolidLanguageServer) -> None:
         """Test finding definition of functions across files (main.ps1 -> utils.ps1)."""
-        # main.ps1 calls Convert-ToUpperCase from utils.ps1 at line 99 (0-indexed: 98)
+        # main.ps1 calls Convert-ToUpperCase from utils.ps1 (around line 99)
         # The call is: $upperName = Convert-ToUpperCase -InputString $User
-        # We'll request definition from the call site in main.ps1
+        # We'll request definition from the call site in main.ps1, which we locate in the file content
         main_path = "main.ps1"
+        call_site = "Convert-ToUpperCase -InputString"
+        main_lines = language_server.retrieve_full_file_content(main_path).split("\n")
+        call_line = next((i for i, line in enumerate(main_lines) if call_site in line), None)
+        assert call_line is not None, f"Should find call site '{call_site}' in {main_path}"
+        call_column = main_lines[call_line].index(call_site) + 1
 
         # Find definition of Convert-ToUpperCase from its usage in main.ps1
-        # Line 99 (1-indexed) = line 98 (0-indexed), character position ~16 for "Convert-ToUpperCase"
-        definition_locations = language_server.request_definition(main_path, 98, 18)
+        definition_locations = language_server.request_definition(main_path, call_line, call_column)
 
         # Should find the definition in utils.ps1
         assert (
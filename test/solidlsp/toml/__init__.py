@@ -1 +1,87 @@
 """TOML language server tests."""
+
+from solidlsp import SolidLanguageServer
+from solidlsp.ls_types import UnifiedSymbolInformation
+
+
+def index_symbols_by_name(symbols: list[UnifiedSymbolInformation]) -> dict[str, list[UnifiedSymbolInformation]]:
+    """
+    :param symbols: the symbols to index
+    :return: a mapping from symbol name to all symbols of that name, in the order of the given symbols
+    """
+    symbols_by_name: dict[str, list[UnifiedSymbolInformation]] = {}
+    for symbol in symbols:
+        symbols_by_name.setdefault(symbol["name"], []).append(symbol)
+    return symbols_by_name
+
+
+def first_symbol(symbols_by_name: dict[str, list[UnifiedSymbolInformation]], name: str) -> UnifiedSymbolInformation | None:
+    """
+    :param symbols_by_name: the index created with `index_symbols_by_name`
+    :param name: the symbol name
+    :return: the first symbol with the given name or None if there is no such symbol
+    """
+    symbols = symbols_by_name.get(name)
+    return symbols[0] if symbols else None
+
+
+class TomlSymbolCache:
+    """
+    Caches the symbols of the TOML test repository's files for the lifetime of a language server instance,
+    such that all tests querying the same file share a single symbol request.
+    """
+
+    def __init__(self, language_server: SolidLanguageServer):
+        self._language_server = language_server
+        self._symbols_and_roots: dict[str, tuple[list[UnifiedSymbolInformation], list[UnifiedSymbolInformation]]] = {}
+        self._symbols_by_name: dict[str, dict[str, list[UnifiedSymbolInformation]]] = {}
+        self._lowered_names: dict[str, str] = {}
+
+    def get_all_symbols_and_roots(self, relative_path: str) -> tuple[list[UnifiedSymbolInformation], list[UnifiedSymbolInformation]]:
+        """
+        :param relative_path: the path of the file relative to the repository root
+        :return: a tuple containing a list of all symbols in the file and a list of its root symbols
+        """
+        symbols_and_roots = self._symbols_and_roots.get(relative_path)
+        if symbols_and_roots is None:
+            symbols_and_roots = self._language_server.request_document_symbols(relative_path).get_all_symbols_and_roots()
+            self._symbols_and_roots[relative_path] = symbols_and_roots
+        return symbols_and_roots
+
+    def get_all_symbols(self, relative_path: str) -> list[UnifiedSymbolInformation]:
+        """
+        :param relative_path: the path of the file relative to the repository root
+        :return: a list of all symbols in the file
+        """
+        return self.get_all_symbols_and_roots(relative_path)[0]
+
+    def get_root_symbols(self, relative_path: str) -> list[UnifiedSymbolInformation]:
+        """
+        :param relative_path: the path of the file relative to the repository root
+        :return: a list of the root symbols in the file
+        """
+        return self.get_all_symbols_and_roots(relative_path)[1]
+
+    def get_symbols_by_name(self, relative_path: str) -> dict[str, list[UnifiedSymbolInformation]]:
+        """
+        :param relative_path: the path of the file relative to the repository root
+        :return: a mapping from symbol name to all symbols of that name in the file (see `index_symbols_by_name`);
+            the mapping is shared between tests and must not be modified
+        """
+        symbols_by_name = self._symbols_by_name.get(relative_path)
+        if symbols_by_name is None:
+            symbols_by_name = index_symbols_by_name(self.get_all_symbols(relative_path))
+            self._symbols_by_name[relative_path] = symbols_by_name
+        return symbols_by_name
+
+    def get_lowered_names(self, relative_path: str) -> str:
+        """
+        :param relative_path: the path of the file relative to the repository root
+        :return: the distinct lower-cased symbol names in the file, joined by newlines, such that
+            `substring in lowered_names` checks whether any symbol name contains the substring
+        """
+        lowered_names = self._lowered_names.get(relative_path)
+        if lowered_names is None:
+            lowered_names = "\n".join(name.lower() for name in self.get_symbols_by_name(relative_path))
+            self._lowered_names[relative_path] = lowered_names
+        return lowered_names
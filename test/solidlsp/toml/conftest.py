@@ -0,0 +1,15 @@
+"""
+Fixtures for the TOML language server tests.
+"""
+
+import pytest
+
+from solidlsp import SolidLanguageServer
+
+from . import TomlSymbolCache
+
+
+@pytest.fixture(scope="module")
+def toml_symbols(language_server: SolidLanguageServer) -> TomlSymbolCache:
+    """The symbol cache for the (module-scoped) TOML language server."""
+    return TomlSymbolCache(language_server)
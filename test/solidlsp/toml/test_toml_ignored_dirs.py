@@ -17,44 +17,33 @@ pytestmark = pytest.mark.toml
 class TestTomlIgnoredDirectories:
     """Test TOML-specific directory ignoring behavior."""
 
-    def test_default_ignored_directories(self, language_server: SolidLanguageServer) -> None:
-        """Test that default TOML directories are ignored."""
-        # Test that TOML/Rust/Node-specific directories are ignored by default
-        assert language_server.is_ignored_dirname("target"), "target should be ignored"
-        assert language_server.is_ignored_dirname(".cargo"), ".cargo should be ignored"
-        assert language_server.is_ignored_dirname("node_modules"), "node_modules should be ignored"
-
-        # Directories starting with . are ignored by base class
-        assert language_server.is_ignored_dirname(".git"), ".git should be ignored"
-        assert language_server.is_ignored_dirname(".venv"), ".venv should be ignored"
-
-    def test_important_directories_not_ignored(self, language_server: SolidLanguageServer) -> None:
-        """Test that important directories are not ignored."""
-        # Common project directories should not be ignored
-        assert not language_server.is_ignored_dirname("src"), "src should not be ignored"
-        assert not language_server.is_ignored_dirname("crates"), "crates should not be ignored"
-        assert not language_server.is_ignored_dirname("lib"), "lib should not be ignored"
-        assert not language_server.is_ignored_dirname("tests"), "tests should not be ignored"
-        assert not language_server.is_ignored_dirname("config"), "config should not be ignored"
-
-    def test_cargo_related_directories(self, language_server: SolidLanguageServer) -> None:
-        """Test Cargo/Rust-related directory handling."""
-        # Rust build directories should be ignored
-        assert language_server.is_ignored_dirname("target"), "target (Rust build) should be ignored"
-        assert language_server.is_ignored_dirname(".cargo"), ".cargo should be ignored"
-
-        # But important Rust directories should not be ignored
-        assert not language_server.is_ignored_dirname("benches"), "benches should not be ignored"
-        assert not language_server.is_ignored_dirname("examples"), "examples should not be ignored"
-
-    def test_various_cache_directories(self, language_server: SolidLanguageServer) -> None:
-        """Test various cache and temporary directories are ignored."""
-        # Directories starting with . are ignored by base class
-        assert language_server.is_ignored_dirname(".cache"), ".cache should be ignored"
-
-        # IDE directories (start with .)
-        assert language_server.is_ignored_dirname(".idea"), ".idea should be ignored"
-        assert language_server.is_ignored_dirname(".vscode"), ".vscode should be ignored"
-
-        # Note: __pycache__ is NOT ignored by TOML server (only Python servers ignore it)
-        assert not language_server.is_ignored_dirname("__pycache__"), "__pycache__ is not TOML-specific"
+    @pytest.mark.parametrize(
+        ("dirname", "expected_ignored"),
+        [
+            # TOML/Rust/Node-specific directories are ignored by default
+            ("target", True),
+            (".cargo", True),
+            ("node_modules", True),
+            # directories starting with . are ignored by the base class (build tools, caches, IDEs)
+            (".git", True),
+            (".venv", True),
+            (".cache", True),
+            (".idea", True),
+            (".vscode", True),
+            # common project directories, including important Rust directories, are not ignored
+            ("src", False),
+            ("crates", False),
+            ("lib", False),
+            ("tests", False),
+            ("config", False),
+            ("benches", False),
+            ("examples", False),
+            # __pycache__ is not TOML-specific (only Python servers ignore it)
+            ("__pycache__", False),
+        ],
+    )
+    def test_is_ignored_dirname(self, language_server: SolidLanguageServer, dirname: str, expected_ignored: bool) -> None:
+        """Test that TOML-specific and hidden directories are ignored while project directories are not."""
+        assert (
+            language_server.is_ignored_dirname(dirname) == expected_ignored
+        ), f"{dirname} should {'' if expected_ignored else 'not '}be ignored"